@@ -1,8 +1,10 @@
 # api.py
+import functools
 import os
+import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Union
 
 from .mirror import IconDatasetMirror
 from .logger import get_logger
@@ -14,12 +16,90 @@ import os
 
 logger = get_logger(__name__)
 
+# Prefer the libyaml-backed parser when available, fall back to pure Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# A value that is nothing but one env reference, e.g. `decompress: ${DECOMPRESS}`
+_ENV_REF_RE = re.compile(r"\$(\w+|\{\w+\})")
+
+
+class _PlainEnvRef(str):
+    """An unquoted scalar that is a single env reference, typed after expansion."""
+
+
+class _ConfigLoader(_YAML_LOADER):
+    """Loader that remembers which single env references were left unquoted."""
+
+
+def _construct_str(loader: yaml.BaseLoader, node: yaml.ScalarNode) -> str:
+    value = loader.construct_scalar(node)
+    # plain style is None with SafeLoader and "" with the libyaml CSafeLoader
+    if not node.style and _ENV_REF_RE.fullmatch(value):
+        return _PlainEnvRef(value)
+    return value
+
+
+_ConfigLoader.add_constructor("tag:yaml.org,2002:str", _construct_str)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(
+    path_str: str, mtime_ns: int, size: int
+) -> Union[Tuple[Tuple[Dict[str, Any], ...], Dict[str, Any]], str]:
+    """
+    Parse a config file, memoized on (path, mtime, size).
+
+    mtime_ns and size are only part of the cache key, so an edited file
+    is re-parsed on the next load. Environment variables are not expanded
+    here, see _expand_env.
+
+    A file that is only valid YAML once expanded, e.g. `[${RUN}, '06']`
+    where `{` is a flow indicator, is returned as raw text instead.
+    """
+    raw_text = Path(path_str).read_text(encoding="utf-8")
+    try:
+        cfg = yaml.load(raw_text, Loader=_ConfigLoader) or {}
+    except yaml.YAMLError:
+        return raw_text
+
+    return tuple(cfg.get("datasets", [])), cfg.get("storage", {})
+
+
+def _expand_env(value: Any) -> Any:
+    """
+    Expand environment variables in the string leaves of a parsed config.
+
+    Returns new containers, so the cached parse result is never shared.
+    An unquoted value made of a single reference is resolved as YAML,
+    keeping e.g. booleans, numbers and lists coming from the environment
+    typed; quoted values always stay strings.
+    """
+    if isinstance(value, str):
+        expanded = os.path.expandvars(value)
+        if not isinstance(value, _PlainEnvRef) or expanded == value:
+            return str(expanded)
+        try:
+            return yaml.load(expanded, Loader=_YAML_LOADER)
+        except yaml.YAMLError:
+            return expanded
+    if isinstance(value, dict):
+        return {k: _expand_env(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_expand_env(v) for v in value]
+    return value
+
+
+def clear_config_cache() -> None:
+    """Drop all parsed configs cached by DwdIconDownloader.load_dataset_config."""
+    _load_yaml_cached.cache_clear()
+
 
 class DwdIconDownloader:
     """
     Class-based orchestrator for DWD ICON dataset downloads.
 
-    - Loads config from YAML (with env expansion).
+    - Loads config from YAML (with env expansion of values).
     - Resolves CONFIG_PATH env overriding the config parameter.
     - Iterates datasets and triggers IconDatasetMirror for each.
     """
@@ -52,14 +132,25 @@ class DwdIconDownloader:
         self, path: Path
     ) -> Tuple[list[Dict[str, Any]], Dict[str, Any]]:
         """
-        Load dataset config from YAML and expand environment variables.
+        Load dataset config from YAML and expand environment variables
+        in its string values.
+
+        Parsed configs are cached per process and reused until the file
+        changes on disk; expansion runs on every load against the current
+        environment.
         """
 
-        raw_text = path.read_text(encoding="utf-8")
-        expanded_text = os.path.expandvars(raw_text)
-        cfg = yaml.safe_load(expanded_text)
+        st = path.stat()
+        cached = _load_yaml_cached(str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+        if isinstance(cached, str):
+            # ${VAR} in a flow collection: expand the text before parsing
+            logger.debug("Expanding env variables in the text of %s", path)
+            cfg = yaml.load(os.path.expandvars(cached), Loader=_YAML_LOADER) or {}
+            return list(cfg.get("datasets", [])), cfg.get("storage", {})
 
-        return cfg.get("datasets", []), cfg.get("storage", {})
+        datasets, storage_cfg = cached
+        return _expand_env(datasets), _expand_env(storage_cfg)
 
     @staticmethod
     def _parse_date(date_str: str) -> datetime:
@@ -56,4 +56,8 @@ def get_logger(
         fh.setFormatter(formatter)
         logger.addHandler(fh)
 
+    if logger.handlers:
+        # we format and emit ourselves, don't format again via the root logger
+        logger.propagate = False
+
     return logger
@@ -1,19 +1,34 @@
 # mirror.py
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any, List
-
-import json
+from typing import Callable, Dict, Any, List, Set, Tuple
+
+import functools
+import os
+import re
+import string
+import threading
+import time
 import requests
-from bs4 import BeautifulSoup
 
 from .logger import get_logger
 from .storage import get_storage, Storage
-from .utils import download_to_storage
+from .utils import (
+    MetadataManifest,
+    create_http_session,
+    download_to_storage,
+    json_dumps,
+    json_loads,
+)
 
 logger = get_logger(__name__)
 
+# DWD directory listings are flat autoindex pages: one href per file
+_HREF_RE = re.compile(rb'href="([^"]+\.grib2\.bz2)"')
+
 
 class IconDatasetMirror:
     """
@@ -22,9 +37,23 @@ class IconDatasetMirror:
     - Incremental: uses metadata.json in storage to track already downloaded files.
     - Uses HTML index only to check file existence.
     - Streams data from HTTP -> Storage, with optional in-memory decompression.
+    - Per-file metadata goes to one _manifest.json per run/variable folder
+      (plus legacy .json sidecars when per_file_sidecar is enabled).
     - Encapsulates metadata and HTML index logic.
+    - HTML indexes are cached per process for `index_ttl` seconds and
+      revalidated with If-Modified-Since once expired.
     """
 
+    # storage uri -> (storage version, parsed metadata.json)
+    _META_CACHE: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+    # (base_url, run, var, date) -> (fetched_at, Last-Modified, links),
+    # least recently stored first; past dates age out once it is full
+    _index_cache: OrderedDict[
+        Tuple[str, str, str, str], Tuple[float, str | None, List[str]]
+    ] = OrderedDict()
+    _INDEX_CACHE_SIZE = 1024
+
     def __init__(
         self,
         dataset: Dict[str, Any],
@@ -39,10 +68,23 @@ class IconDatasetMirror:
         self.dataset_name: str = dataset["name"]
         self.decompress: bool = bool(storage_cfg.get("decompress", False))
         self.base_url: str = dataset["base_url"]
+        self.parallelism: int = int(dataset.get("parallelism", 8))
+        # share the cores between concurrently decompressing downloads
+        self.decompress_threads: int = max(1, (os.cpu_count() or 1) // self.parallelism)
+        self.index_ttl: float = float(storage_cfg.get("index_ttl", 300))
+        self.per_file_sidecar: bool = bool(storage_cfg.get("per_file_sidecar", False))
+
+        # file_template with the dataset-constant fields already substituted
+        self._file_template: str = self._precompile_template(dataset["file_template"])
+
+        # one keep-alive connection pool for index pages and downloads
+        self._http: requests.Session = create_http_session()
 
         # where we keep incremental state
         self.metadata_key: str = self._metadata_key()
         self.metadata: Dict[str, Any] = self._load_metadata()
+        self._metadata_lock = threading.Lock()
+        self._metadata_dirty = False
 
     # ------------------------------------------------------------------
     # Public API
@@ -62,72 +104,207 @@ class IconDatasetMirror:
         variables: List[str] = self.dataset["variables"]
         steps: List[int] = self.dataset["forecast_steps"]
 
-        for run in runs:
-            run_hour = int(run)
-            run_dt = datetime(
-                self.date.year,
-                self.date.month,
-                self.date.day,
-                run_hour,
-                tzinfo=timezone.utc,
-            )
-            if run_dt > now:
-                logger.debug("Skipping future run %s%s", yyyymmdd, run)
-                continue
-
-            for var in variables:
-                self.metadata.setdefault(var, {})
-
-                available_files = self._get_available_files_from_html(
-                    run=run,
-                    var=var,
-                    date_str=yyyymmdd,
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            for run in runs:
+                run_hour = int(run)
+                run_dt = datetime(
+                    self.date.year,
+                    self.date.month,
+                    self.date.day,
+                    run_hour,
+                    tzinfo=timezone.utc,
                 )
-                if not available_files:
-                    logger.warning(
-                        "HTML index is empty or failed for '%s/%s'. Skipping",
-                        run,
-                        var,
-                    )
+                if run_dt > now:
+                    logger.debug("Skipping future run %s%s", yyyymmdd, run)
                     continue
 
-                for step in steps:
-                    filename = self._build_filename(yyyymmdd, run, var, step)
+                for var in variables:
+                    self.metadata.setdefault(var, {})
 
-                    # Skip if already recorded in metadata
-                    if self._already_downloaded(var, filename):
-                        continue
-
-                    # Skip if not present on the remote HTML listing
-                    if filename not in available_files:
+                    available_files = self._get_available_files_from_html(
+                        run=run,
+                        var=var,
+                        date_str=yyyymmdd,
+                    )
+                    if not available_files:
                         logger.warning(
-                            "File not found on server, skipping: %s", filename
+                            "HTML index is empty or failed for '%s/%s'. Skipping",
+                            run,
+                            var,
                         )
                         continue
 
-                    url = f"{self.base_url}/{run}/{var}/{filename}"
-                    data_key = self._build_data_key(yyyymmdd, run, var, filename)
-                    meta_key = self._build_meta_key(yyyymmdd, run, var, filename)
+                    # Per-step loop: bind everything that only depends on (run, var)
+                    build_filename = self._filename_formatter(yyyymmdd, run, var)
+                    available = set(available_files)
+
+                    jobs: List[Tuple[str, str, str, str]] = []
+                    for step in steps:
+                        filename = build_filename(step=step)
+
+                        # Skip if already recorded in metadata
+                        if self._already_downloaded(var, filename):
+                            continue
+
+                        # Skip if not present on the remote HTML listing
+                        if filename not in available:
+                            logger.warning(
+                                "File not found on server, skipping: %s", filename
+                            )
+                            continue
+
+                        url = f"{self.base_url}/{run}/{var}/{filename}"
+                        data_key = self._build_data_key(yyyymmdd, run, var, filename)
+                        meta_key = self._build_meta_key(yyyymmdd, run, var, filename)
+                        jobs.append((filename, url, data_key, meta_key))
 
+                    if not jobs:
+                        continue
+
+                    # One LIST per (run, var) instead of an exists() per file
+                    prefix = f"{self.dataset_name}/{yyyymmdd}/{run}/{var}/"
+                    manifest_key = self._build_manifest_key(yyyymmdd, run, var)
                     try:
-                        success = download_to_storage(
-                            url=url,
-                            storage=self.storage,
-                            data_key=data_key,
-                            meta_key=meta_key,
-                            decompress=self.decompress,
+                        existing: Set[str] = set(self.storage.list(prefix))
+                        has_manifest = manifest_key in existing
+                    except Exception as e:
+                        # Treat every file as missing. The manifest is still
+                        # loaded: a missing one starts empty, an unreadable one
+                        # is merged on flush or not written (MetadataManifest)
+                        logger.warning("Failed to list %s: %s", prefix, e)
+                        existing = set()
+                        has_manifest = True
+
+                    if has_manifest:
+                        manifest = MetadataManifest.load(self.storage, manifest_key)
+                    else:
+                        manifest = MetadataManifest(self.storage, manifest_key)
+
+                    # Downloads are I/O bound: overlap them, wait per (run, var)
+                    futures = [
+                        executor.submit(
+                            self._download_file, var, existing, manifest, *job
                         )
-                        if success:
-                            self._mark_downloaded(var, filename)
-                            logger.info("Downloaded %s -> %s", filename, data_key)
+                        for job in jobs
+                    ]
+                    for future in futures:
+                        future.result()
+
+                    try:
+                        manifest.flush()
                     except Exception as e:
                         logger.error(
-                            "Failed downloading %s: %s", filename, e, exc_info=True
+                            "Failed to write manifest to %s: %s", manifest_key, e
                         )
 
         self._save_metadata()
         logger.info("Completed mirror for dataset %s", self.dataset_name)
 
+    # ------------------------------------------------------------------
+    # Internal helpers: download
+    # ------------------------------------------------------------------
+
+    def _download_file(
+        self,
+        var: str,
+        existing: Set[str],
+        manifest: MetadataManifest,
+        filename: str,
+        url: str,
+        data_key: str,
+        meta_key: str,
+    ) -> bool:
+        """
+        Download a single file into storage and record it in metadata.
+        Runs on a worker thread; errors are logged, never raised.
+
+        `existing` holds the storage keys already present under the
+        (run, var) prefix and is kept up to date as files are written.
+        """
+        try:
+            if self._is_unchanged_remote(url, data_key, meta_key, existing, manifest):
+                self._mark_downloaded(var, filename)
+                logger.info("Unchanged on server, skipping %s", filename)
+                return True
+
+            success = download_to_storage(
+                url=url,
+                storage=self.storage,
+                data_key=data_key,
+                meta_key=meta_key if self.per_file_sidecar else None,
+                decompress=self.decompress,
+                session=self._http,
+                manifest=manifest,
+                decompress_threads=self.decompress_threads,
+            )
+            if success:
+                existing.add(data_key)
+                if self.per_file_sidecar:
+                    existing.add(meta_key)
+                self._mark_downloaded(var, filename)
+                logger.info("Downloaded %s -> %s", filename, data_key)
+            return success
+        except Exception as e:
+            logger.error("Failed downloading %s: %s", filename, e, exc_info=True)
+            return False
+
+    def _is_unchanged_remote(
+        self,
+        url: str,
+        data_key: str,
+        meta_key: str,
+        existing: Set[str],
+        manifest: MetadataManifest,
+    ) -> bool:
+        """
+        Revalidate a previously stored file against the server.
+
+        Uses the ETag / Last-Modified recorded in the manifest (or a legacy
+        per-file sidecar) for a conditional HEAD request. Returns True only
+        when the server confirms the remote file did not change.
+        """
+        if data_key not in existing:
+            return False
+
+        name = data_key.rsplit("/", 1)[-1]
+        stored = manifest.get(name)
+        if stored is None:
+            if meta_key not in existing:
+                return False
+            try:
+                with self.storage.open(meta_key, "rb") as f:
+                    stored = json_loads(f.read())
+            except Exception as e:
+                logger.warning("Failed to read metadata sidecar %s: %s", meta_key, e)
+                return False
+
+        etag = stored.get("http_etag")
+        last_modified = stored.get("http_last_modified")
+        if not etag and not last_modified:
+            return False
+
+        # Same representation as the stored GET (see download_to_storage):
+        # compressing servers alter the ETag (W/..., -gzip)
+        headers = {"Accept-Encoding": "identity"}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            resp = self._http.head(url, headers=headers, timeout=30)
+        except requests.RequestException as e:
+            # revalidation only saves work: fall back to a normal download
+            logger.warning("Failed to revalidate %s, downloading: %s", url, e)
+            return False
+        unchanged = resp.status_code == 304 or bool(
+            resp.status_code == 200 and etag and resp.headers.get("ETag") == etag
+        )
+        if unchanged and manifest.get(name) is None:
+            # carry legacy sidecar metadata over into the manifest
+            manifest.record(name, stored)
+        return unchanged
+
     # ------------------------------------------------------------------
     # Internal helpers: metadata
     # ------------------------------------------------------------------
@@ -142,37 +319,77 @@ class IconDatasetMirror:
         """
         Load metadata.json from storage backend (FS or S3).
         Returns {} if not present or unreadable.
+
+        Parsed content is cached per process and reused as long as the
+        stored object's version (mtime or ETag) is unchanged.
         """
-        if not self.storage.exists(self.metadata_key):
+        version = self.storage.version(self.metadata_key)
+        if version is None:
             return {}
+
+        cache_key = self.storage.uri(self.metadata_key)
+        cached = self._META_CACHE.get(cache_key)
+        if cached and cached[0] == version:
+            logger.debug("Using cached metadata.json for %s", self.metadata_key)
+            return self._copy_metadata(cached[1])
+
         try:
             with self.storage.open(self.metadata_key, "rb") as f:
-                return json.load(f)
+                metadata = json_loads(f.read())
         except Exception as e:
             logger.warning(
                 "Failed to read metadata.json from %s: %s", self.metadata_key, e
             )
             return {}
 
+        self._META_CACHE[cache_key] = (version, self._copy_metadata(metadata))
+        return metadata
+
     def _save_metadata(self) -> None:
         """
         Save metadata.json to the configured storage backend (FS or S3) using streaming.
+        Skipped when nothing was marked downloaded since it was loaded.
         """
+        if not self._metadata_dirty:
+            logger.debug("metadata.json unchanged, not saving %s", self.metadata_key)
+            return
         try:
-            payload = json.dumps(self.metadata, indent=2).encode("utf-8")
+            payload = json_dumps(self.metadata)
             self.storage.write_stream(self.metadata_key, (payload,))
+            self._metadata_dirty = False
             logger.debug("Saved metadata.json -> %s", self.metadata_key)
         except Exception as e:
             logger.error(
                 "Failed to write metadata.json to %s: %s", self.metadata_key, e
             )
+            return
+
+        version = self.storage.version(self.metadata_key)
+        if version is not None:
+            self._META_CACHE[self.storage.uri(self.metadata_key)] = (
+                version,
+                self._copy_metadata(self.metadata),
+            )
+
+    @staticmethod
+    def _copy_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        # {var: {filename: timestamp}}: two levels are enough to decouple
+        return {
+            var: dict(files) if isinstance(files, dict) else files
+            for var, files in metadata.items()
+        }
 
     def _already_downloaded(self, var: str, filename: str) -> bool:
-        return filename in self.metadata.get(var, {})
+        # metadata[var] is already a hash index of filenames; avoid
+        # building a throwaway {} default on every call
+        files = self.metadata.get(var)
+        return files is not None and filename in files
 
     def _mark_downloaded(self, var: str, filename: str) -> None:
-        self.metadata.setdefault(var, {})
-        self.metadata[var][filename] = datetime.now(timezone.utc).isoformat()
+        with self._metadata_lock:
+            self.metadata.setdefault(var, {})
+            self.metadata[var][filename] = datetime.now(timezone.utc).isoformat()
+            self._metadata_dirty = True
 
     # ------------------------------------------------------------------
     # Internal helpers: HTML index
@@ -190,53 +407,120 @@ class IconDatasetMirror:
         This is now encapsulated inside the IconDatasetMirror.
         """
         folder_url = f"{self.base_url}/{run}/{var}/"
+        cache_key = (self.base_url, run, var, date_str)
+        cached = self._index_cache.get(cache_key)
+        if cached and time.time() - cached[0] < self.index_ttl:
+            logger.debug("Using cached HTML index for %s", folder_url)
+            return cached[2]
+
+        headers = {}
+        if cached and cached[1]:
+            headers["If-Modified-Since"] = cached[1]
+
         try:
-            resp = requests.get(folder_url, timeout=30)
+            resp = self._http.get(folder_url, headers=headers, timeout=30)
+            if cached and resp.status_code == 304:
+                logger.debug("HTML index not modified at %s", folder_url)
+                self._cache_index(cache_key, (time.time(), cached[1], cached[2]))
+                return cached[2]
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-            links = [
-                str(a["href"])
-                for a in soup.find_all("a")
-                if str(a.get("href", "")).endswith(".grib2.bz2")
-                and date_str in str(a.get("href", ""))
-            ]
+            if os.getenv("DWD_HTML_PARSER") == "bs4":
+                links = self._parse_html_index_bs4(resp.text, date_str)
+            else:
+                date_str_b = date_str.encode()
+                links = [
+                    m.group(1).decode("ascii")
+                    for m in _HREF_RE.finditer(resp.content)
+                    if date_str_b in m.group(1)
+                ]
             logger.debug("Found %d files at %s", len(links), folder_url)
+            if links:
+                # Empty listings are not cached: the run may not be published yet
+                self._cache_index(
+                    cache_key,
+                    (time.time(), resp.headers.get("Last-Modified"), links),
+                )
             return links
         except Exception as e:
             logger.warning("Failed to scrape HTML index %s: %s", folder_url, e)
             return []
 
+    @classmethod
+    def _cache_index(
+        cls,
+        cache_key: Tuple[str, str, str, str],
+        entry: Tuple[float, str | None, List[str]],
+    ) -> None:
+        cls._index_cache[cache_key] = entry
+        cls._index_cache.move_to_end(cache_key)
+        while len(cls._index_cache) > cls._INDEX_CACHE_SIZE:
+            cls._index_cache.popitem(last=False)
+
+    @staticmethod
+    def _parse_html_index_bs4(html: str, date_str: str) -> List[str]:
+        """
+        Full HTML parser fallback, enabled with DWD_HTML_PARSER=bs4 in case
+        a listing does not match the href regex.
+        """
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        return [
+            str(a["href"])
+            for a in soup.find_all("a")
+            if str(a.get("href", "")).endswith(".grib2.bz2")
+            and date_str in str(a.get("href", ""))
+        ]
+
     # ------------------------------------------------------------------
     # Internal helpers: filename & keys
     # ------------------------------------------------------------------
 
-    def _build_filename(
+    def _filename_formatter(
         self,
         yyyymmdd: str,
         run: str,
         var: str,
-        step: int,
-    ) -> str:
+    ) -> Callable[..., str]:
         """
-        Build the remote filename based on the dataset template.
+        Return a callable building remote filenames for one run/variable,
+        so only {step} is left to format per file.
         Supports {grid}, {subgrid}, {level}, {date}, {run}, {step}, {var}, {var_upper}.
         """
-        template = self.dataset["file_template"]
-        grid = self.dataset.get("grid", "")
-        subgrid = self.dataset.get("subgrid", "")
-        level = self.dataset.get("level", "")
-        var_upper = var.upper()
-        return template.format(
-            grid=grid,
-            subgrid=subgrid,
-            level=level,
+        return functools.partial(
+            self._file_template.format,
             date=yyyymmdd,
             run=run,
-            step=step,
             var=var,
-            var_upper=var_upper,
+            var_upper=var.upper(),
         )
 
+    def _precompile_template(self, template: str) -> str:
+        """
+        Substitute {grid}, {subgrid} and {level} once, leaving the per-file
+        fields in place, so the hot path only formats what actually varies.
+        """
+        constants = {
+            "grid": self.dataset.get("grid", ""),
+            "subgrid": self.dataset.get("subgrid", ""),
+            "level": self.dataset.get("level", ""),
+        }
+        formatter = string.Formatter()
+        parts: List[str] = []
+        for literal, field, spec, conversion in formatter.parse(template):
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if field in constants:
+                value = formatter.convert_field(constants[field], conversion)
+                value = formatter.format_field(value, spec or "")
+                parts.append(value.replace("{", "{{").replace("}", "}}"))
+            else:
+                conv = f"!{conversion}" if conversion else ""
+                fmt = f":{spec}" if spec else ""
+                parts.append(f"{{{field}{conv}{fmt}}}")
+        return "".join(parts)
+
     def _build_data_key(
         self,
         yyyymmdd: str,
@@ -254,6 +538,17 @@ class IconDatasetMirror:
             filename = filename[:-4]  # strip .bz2
         return f"{self.dataset_name}/{yyyymmdd}/{run}/{var}/{filename}"
 
+    def _build_manifest_key(
+        self,
+        yyyymmdd: str,
+        run: str,
+        var: str,
+    ) -> str:
+        """
+        Logical key for the metadata manifest of one run/variable folder.
+        """
+        return f"{self.dataset_name}/{yyyymmdd}/{run}/{var}/_manifest.json"
+
     def _build_meta_key(
         self,
         yyyymmdd: str,
@@ -1,14 +1,61 @@
 # storage.py
 import os
 import io
-import boto3
+import functools
+import queue
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Iterable, BinaryIO
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, BinaryIO, Optional
 from .logger import get_logger
 from typing import BinaryIO, cast
 
+if TYPE_CHECKING:
+    from boto3.s3.transfer import TransferConfig
+
 logger = get_logger(__name__)
 
+# boto3 takes a noticeable time to import, so it is only loaded once an
+# S3 backend is actually used; FS-only runs never pay for it.
+
+
+@functools.lru_cache(maxsize=None)
+def _s3_transfer_config() -> "TransferConfig":
+    from boto3.s3.transfer import TransferConfig
+
+    # GRIB2 files are often hundreds of MB once decompressed
+    return TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=8,
+        use_threads=True,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _make_s3_client(
+    endpoint_url: Optional[str],
+    access_key_id: Optional[str],
+    secret_access_key: Optional[str],
+):
+    """
+    Build (once per endpoint and credentials) a thread-safe S3 client,
+    sized for the parallel download workers.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint_url,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        config=Config(
+            max_pool_connections=64,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+            tcp_keepalive=True,
+        ),
+    )
+
 
 def get_storage(storage_cfg: Dict[str, Any]) -> "Storage":
     """Initialize storage backend from config or env."""
@@ -43,6 +90,15 @@ def get_storage(storage_cfg: Dict[str, Any]) -> "Storage":
         raise ValueError(f"Unknown storage type: {stype}")
 
 
+def is_not_found(exc: BaseException) -> bool:
+    """Whether `exc`, raised by a Storage read, means the key does not exist."""
+    if isinstance(exc, FileNotFoundError):
+        return True
+    # botocore ClientError: NoSuchKey from get_object, 404 from head_object
+    code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+    return code in ("NoSuchKey", "404")
+
+
 class Storage(ABC):
     """
     Abstract base for storage backends.
@@ -56,6 +112,19 @@ class Storage(ABC):
     @abstractmethod
     def list(self, prefix: str = "") -> List[str]: ...
 
+    @abstractmethod
+    def version(self, key: str) -> Optional[str]:
+        """
+        Opaque token that changes whenever the object at `key` changes.
+        Returns None if the key does not exist.
+        """
+        ...
+
+    @abstractmethod
+    def uri(self, key: str) -> str:
+        """Fully qualified location of `key`, unique across backends."""
+        ...
+
     @abstractmethod
     def write_stream(self, key: str, chunks: Iterable[bytes]) -> None:
         """
@@ -64,11 +133,19 @@ class Storage(ABC):
         """
         ...
 
+    @abstractmethod
+    def open_write(self, key: str) -> BinaryIO:
+        """
+        Open a key for streaming writes, to be used as a context manager.
+        Data is committed when the writer is closed without an error.
+        """
+        ...
+
     @abstractmethod
     def open(self, key: str, mode: str = "rb") -> BinaryIO:
         """
         Open a key for reading (mode='rb').
-        Write mode is not required – `write_stream` should be used instead.
+        Write mode is not supported – use `write_stream` or `open_write` instead.
         """
         ...
 
@@ -86,13 +163,37 @@ class FSStorage(Storage):
     def exists(self, key: str) -> bool:
         return os.path.exists(self._full_path(key))
 
+    def version(self, key: str) -> Optional[str]:
+        try:
+            st = os.stat(self._full_path(key))
+        except FileNotFoundError:
+            return None
+        return f"{st.st_mtime_ns}-{st.st_size}"
+
+    def uri(self, key: str) -> str:
+        return f"file://{self._full_path(key)}"
+
     def list(self, prefix: str = "") -> List[str]:
+        # Only scan the directory holding the prefix, then recurse into matches
+        dirname, name_prefix = os.path.split(prefix)
+        root = self._full_path(dirname)
+        if not os.path.isdir(root):
+            return []
+
         results: List[str] = []
-        for root, _, files in os.walk(self.base_dir):
-            for f in files:
-                rel = os.path.relpath(os.path.join(root, f), self.base_dir)
-                if rel.startswith(prefix):
-                    results.append(rel)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            with os.scandir(current) as it:
+                for entry in it:
+                    if current == root and not entry.name.startswith(name_prefix):
+                        continue
+                    if entry.is_dir():
+                        # like os.walk: symlinked dirs are neither files nor followed
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    else:
+                        results.append(os.path.relpath(entry.path, self.base_dir))
         return results
 
     def write_stream(self, key: str, chunks: Iterable[bytes]) -> None:
@@ -103,6 +204,11 @@ class FSStorage(Storage):
                 if chunk:
                     f.write(chunk)
 
+    def open_write(self, key: str) -> BinaryIO:
+        path = self._full_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return cast(BinaryIO, open(path, "wb"))
+
     def open(self, key: str, mode: str = "rb") -> BinaryIO:
         if "r" in mode and "+" not in mode and "w" not in mode:
             path = self._full_path(key)
@@ -119,35 +225,129 @@ class _IterableReader(io.RawIOBase):
     def __init__(self, chunks: Iterable[bytes]):
         super().__init__()
         self._iter = iter(chunks)
-        self._buffer = b""
+        self._buffer = bytearray()
+        self._eof = False
 
     def readable(self) -> bool:
         return True
 
     def readinto(self, b) -> int:
-        if not self._buffer:
+        # Gather chunks until the request can be served in a single copy
+        size = len(b)
+        while len(self._buffer) < size and not self._eof:
             try:
-                self._buffer = next(self._iter)
+                self._buffer += next(self._iter)
             except StopIteration:
-                return 0  # EOF
-        n = min(len(b), len(self._buffer))
-        b[:n] = self._buffer[:n]
-        self._buffer = self._buffer[n:]
+                self._eof = True
+        n = min(size, len(self._buffer))
+        # copy through a view; the view must be released before resizing
+        with memoryview(self._buffer) as view:
+            b[:n] = view[:n]
+        del self._buffer[:n]
         return n
 
 
+class _S3StreamWriter(io.RawIOBase):
+    """
+    Writable file-like object feeding a background upload_fileobj.
+
+    Written chunks go through a bounded queue to an `_IterableReader`
+    consumed by boto3 on a separate thread, so the producer never holds
+    more than a few chunks in memory.
+    """
+
+    _DONE = object()
+
+    def __init__(self, s3, bucket: str, key: str, config: "TransferConfig"):
+        super().__init__()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=4)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._upload,
+            args=(s3, bucket, key, config),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _chunks(self) -> Iterable[bytes]:
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def _upload(self, s3, bucket: str, key: str, config: "TransferConfig") -> None:
+        try:
+            s3.upload_fileobj(
+                _IterableReader(self._chunks()), bucket, key, Config=config
+            )
+        except BaseException as e:
+            self._error = e
+            # unblock a producer waiting on a full queue
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _put(self, item: Any) -> None:
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+        if self._error:
+            raise self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if self._error:
+            raise self._error
+        data = bytes(b)
+        if data:
+            self._put(data)
+        return len(data)
+
+    def abort(self, exc: BaseException) -> None:
+        """Fail the upload so boto3 discards any uploaded parts."""
+        if not self.closed:
+            try:
+                self._put(exc)
+            except BaseException:
+                pass  # upload already failed on its own
+            self._thread.join()
+            super().close()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._put(self._DONE)
+            self._thread.join()
+            super().close()
+            if self._error:
+                raise self._error
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.abort(exc)
+        else:
+            self.close()
+
+
 class S3Storage(Storage):
     """S3/Minio-based storage with streaming support."""
 
     def __init__(self, bucket: str, endpoint_url: str | None = None):
         self.bucket = bucket
-        self.s3 = boto3.client(
-            "s3",
-            endpoint_url=endpoint_url,
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID")
-            or os.getenv("S3_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
-            or os.getenv("S3_SECRET_ACCESS_KEY"),
+        self.endpoint_url = endpoint_url
+        self.s3 = _make_s3_client(
+            endpoint_url,
+            os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("S3_ACCESS_KEY_ID"),
+            os.getenv("AWS_SECRET_ACCESS_KEY") or os.getenv("S3_SECRET_ACCESS_KEY"),
         )
 
     def exists(self, key: str) -> bool:
@@ -157,13 +357,31 @@ class S3Storage(Storage):
         except self.s3.exceptions.ClientError:
             return False
 
+    def version(self, key: str) -> Optional[str]:
+        try:
+            return self.s3.head_object(Bucket=self.bucket, Key=key)["ETag"]
+        except self.s3.exceptions.ClientError:
+            return None
+
+    def uri(self, key: str) -> str:
+        return f"{self.endpoint_url or 's3:/'}/{self.bucket}/{key}"
+
     def list(self, prefix: str = "") -> List[str]:
-        resp = self.s3.list_objects_v2(Bucket=self.bucket, Prefix=prefix)
-        return [obj["Key"] for obj in resp.get("Contents", [])]
+        # list_objects_v2 returns at most 1000 keys per call
+        paginator = self.s3.get_paginator("list_objects_v2")
+        return [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
 
     def write_stream(self, key: str, chunks: Iterable[bytes]) -> None:
         reader = _IterableReader(chunks)
-        self.s3.upload_fileobj(reader, self.bucket, key)
+        self.s3.upload_fileobj(reader, self.bucket, key, Config=_s3_transfer_config())
+
+    def open_write(self, key: str) -> BinaryIO:
+        writer = _S3StreamWriter(self.s3, self.bucket, key, _s3_transfer_config())
+        return cast(BinaryIO, writer)
 
     def open(self, key: str, mode: str = "rb") -> BinaryIO:
         if "r" in mode and "+" not in mode and "w" not in mode:
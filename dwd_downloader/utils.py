@@ -3,17 +3,78 @@ from __future__ import annotations
 
 import bz2
 import hashlib
+import io
 import json
+import os
+import threading
 from datetime import datetime, timezone
 from typing import Optional, Dict, Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+try:
+    import indexed_bzip2
+except ImportError:  # optional parallel bz2 decoder, see the "fast" extra
+    indexed_bzip2 = None
 
 from .logger import get_logger
-from .storage import Storage
+from .storage import Storage, is_not_found
 
 logger = get_logger(__name__)
 
+# Larger chunks mean fewer Python-level iterations per file
+_CHUNK_SIZE = 8 * 1024 * 1024
+
+_default_session: Optional[requests.Session] = None
+
+
+def json_dumps(obj: object) -> bytes:
+    """Serialize to indented, key-sorted UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> object:
+    """Parse JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def create_http_session() -> requests.Session:
+    """
+    Build a requests.Session with a pooled, keep-alive adapter.
+
+    DWD files are all served from the same host, so reusing connections
+    avoids a TCP+TLS handshake per file.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # HTML indexes compress well; requests decodes them transparently
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+def _get_default_session() -> requests.Session:
+    global _default_session
+    if _default_session is None:
+        _default_session = create_http_session()
+    return _default_session
+
 
 def _metadata_dict(
     url: str,
@@ -40,23 +101,130 @@ def _metadata_dict(
     return metadata
 
 
+class MetadataManifest:
+    """
+    Metadata for all files under one storage folder, kept in memory and
+    written as a single JSON document instead of one sidecar per file.
+
+    A manifest created with `loaded=False` stands for a stored document
+    that could not be read: it is merged into that document on flush,
+    never written over it.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        key: str,
+        entries: Optional[Dict[str, Dict[str, object]]] = None,
+        loaded: bool = True,
+    ):
+        self.storage = storage
+        self.key = key
+        self.entries: Dict[str, Dict[str, object]] = dict(entries or {})
+        self._loaded = loaded
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read(storage: Storage, key: str) -> Dict[str, Dict[str, object]]:
+        """Stored entries, or {} if there is no manifest yet."""
+        try:
+            with storage.open(key, "rb") as f:
+                return json_loads(f.read())
+        except Exception as e:
+            if is_not_found(e):
+                return {}
+            raise
+
+    @classmethod
+    def load(cls, storage: Storage, key: str) -> "MetadataManifest":
+        """
+        Load an existing manifest from storage.
+        Starts empty if there is none; if it is unreadable, starts empty
+        but not loaded (see class docstring).
+        """
+        try:
+            return cls(storage, key, cls._read(storage, key))
+        except Exception as e:
+            logger.warning("Failed to read manifest %s: %s", key, e)
+            return cls(storage, key, loaded=False)
+
+    def get(self, name: str) -> Optional[Dict[str, object]]:
+        return self.entries.get(name)
+
+    def record(self, name: str, metadata: Dict[str, object]) -> None:
+        with self._lock:
+            self.entries[name] = metadata
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Write the manifest to storage if anything was recorded since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if not self._loaded:
+                # re-read, so entries of earlier runs are not overwritten
+                try:
+                    stored = self._read(self.storage, self.key)
+                except Exception as e:
+                    logger.warning(
+                        "Not writing manifest %s, still unreadable: %s", self.key, e
+                    )
+                    return
+                self.entries = {**stored, **self.entries}
+                self._loaded = True
+            payload = json_dumps(self.entries)
+            self._dirty = False
+        self.storage.write_stream(self.key, (payload,))
+
+
 def _stream_decompressed_bz2(
     response: requests.Response,
+    threads: int = 1,
 ) -> Iterable[bytes]:
+    if indexed_bzip2 is not None and threads > 1:
+        yield from _stream_decompressed_bz2_parallel(response, threads)
+        return
+
     decompressor = bz2.BZ2Decompressor()
-    for chunk in response.iter_content(1024 * 1024):
-        if not chunk:
-            continue
+    for chunk in _stream_raw(response):
         data = decompressor.decompress(chunk)
         if data:
             yield data
     # BZ2Decompressor has no flush; any remaining data is returned during decompress calls.
 
 
+def _stream_decompressed_bz2_parallel(
+    response: requests.Response,
+    threads: int,
+) -> Iterable[bytes]:
+    """
+    Decode bz2 blocks on `threads` cores with indexed_bzip2.
+
+    Its reader needs a seekable source, so the compressed body is buffered
+    in memory first; the decompressed output is still streamed in chunks.
+    """
+    compressed = io.BytesIO()
+    for chunk in _stream_raw(response):
+        compressed.write(chunk)
+    compressed.seek(0)
+
+    with indexed_bzip2.IndexedBzip2File(compressed, parallelization=threads) as f:
+        while True:
+            data = f.read(_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+
+
 def _stream_raw(response: requests.Response) -> Iterable[bytes]:
-    for chunk in response.iter_content(1024 * 1024):
-        if chunk:
-            yield chunk
+    # Read straight from urllib3, bypassing requests' iter_content layer.
+    # Downloads are requested with identity encoding, so nothing to decode.
+    while True:
+        chunk = response.raw.read(_CHUNK_SIZE, decode_content=False)
+        if not chunk:
+            break
+        yield chunk
 
 
 def download_to_storage(
@@ -66,20 +234,36 @@ def download_to_storage(
     meta_key: Optional[str] = None,
     decompress: bool = False,
     timeout: int = 30,
+    session: Optional[requests.Session] = None,
+    manifest: Optional[MetadataManifest] = None,
+    decompress_threads: Optional[int] = None,
 ) -> bool:
     """
     Stream a remote file directly into the storage backend.
 
     - If decompress=True and the source is .bz2, we decompress in-memory and store
-      the decompressed bytes at `data_key`.
+      the decompressed bytes at `data_key`. With indexed_bzip2 installed,
+      decoding uses `decompress_threads` cores (default: all of them);
+      callers downloading files concurrently should split the cores.
     - No intermediate files on local disk are created (only streaming).
     - A small JSON metadata sidecar is written to `meta_key` if provided.
+    - Metadata is recorded in `manifest` if provided, under the stored
+      file name.
+    - Connections are reused through `session`, or a shared module-level
+      session when not provided.
 
     Returns:
         True if download completed successfully, False if remote was not available.
     """
+    http = session or _get_default_session()
     try:
-        with requests.get(url, stream=True, timeout=timeout) as resp:
+        # Files are already bz2: ask for the exact bytes so the hash matches
+        with http.get(
+            url,
+            stream=True,
+            timeout=timeout,
+            headers={"Accept-Encoding": "identity"},
+        ) as resp:
             if resp.status_code != 200:
                 logger.warning("Failed to download %s (code %s)", url, resp.status_code)
                 return False
@@ -87,32 +271,31 @@ def download_to_storage(
             hasher = hashlib.sha256()
             size_bytes = 0
 
-            # Build a generator that both computes metadata and yields bytes
             if decompress:
-                raw_stream = _stream_decompressed_bz2(resp)
+                threads = decompress_threads or os.cpu_count() or 1
+                raw_stream = _stream_decompressed_bz2(resp, threads)
             else:
                 raw_stream = _stream_raw(resp)
 
-            def meta_stream():
-                nonlocal size_bytes
+            # First: write file bytes, hashing and counting in the same pass
+            with storage.open_write(data_key) as writer:
                 for chunk in raw_stream:
                     hasher.update(chunk)
                     size_bytes += len(chunk)
-                    yield chunk
-
-            # First: write file bytes
-            storage.write_stream(data_key, meta_stream())
+                    writer.write(chunk)
 
-            # Then: write metadata JSON if requested
-            if meta_key:
+            # Then: record metadata if requested
+            if meta_key or manifest:
                 metadata = _metadata_dict(
                     url,
                     sha256=hasher.hexdigest(),
                     size_bytes=size_bytes,
                     http_headers=dict(resp.headers),
                 )
-                payload = json.dumps(metadata, indent=2, sort_keys=True).encode("utf-8")
-                storage.write_stream(meta_key, (payload,))
+                if manifest:
+                    manifest.record(data_key.rsplit("/", 1)[-1], metadata)
+                if meta_key:
+                    storage.write_stream(meta_key, (json_dumps(metadata),))
             return True
 
     except requests.HTTPError as he: